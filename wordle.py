@@ -5,13 +5,50 @@ This requires a newline-separate file with dictionary words in ./words.txt.
 """
 
 import re
+import os
 import random
+import functools
 import argparse
+import multiprocessing
 from collections.abc import Sequence, Mapping, Iterable
 from typing import Optional
-from array import array
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 ALL_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+# Bitmask with one bit set per letter of the alphabet
+ALL_LETTERS_MASK = (1 << 26) - 1
+# Pattern a feedback result string must match
+_RESULT_RE = re.compile(r'[CLX]+')
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _score_codes_kernel(codes, npatterns):
+        """Computes the feedback-pattern entropy of each row of encoded result codes.
+
+        Compiled scoring kernel used by WordleSolver.get_guess when numba is available.  codes
+        holds one row per candidate guess of the precomputed feedback codes against each
+        potential solution; rows are histogrammed and scored in parallel.
+        """
+        nguesses, npotsols = codes.shape
+        scores = np.zeros(nguesses, dtype=np.float64)
+        for g in numba.prange(nguesses):
+            group_counts = np.zeros(npatterns, dtype=np.int32)
+            for s in range(npotsols):
+                group_counts[codes[g, s]] += 1
+            entropy = 0.0
+            for count in group_counts:
+                if count > 0:
+                    p = count / npotsols
+                    entropy -= p * np.log(p)
+            scores[g] = entropy
+        return scores
 
 class WordleSolver:
 
@@ -23,102 +60,230 @@ class WordleSolver:
             self.all_guess_words = self.all_solution_words.copy()
         else:
             self.all_guess_words = self._load_words(dictfile_guesses, allow_dup_letters)
-        self._fast_word_result_buf = array('b', [ 0 for i in range(256) ])
+        # Precompute a 26-bit letter-presence bitmask for each word so that bulk letter-based
+        # filtering can be done with vectorized numpy ops instead of per-word set operations.
+        self.solution_word_masks = WordleSolver._get_letter_masks(self.all_solution_words)
+        self.guess_word_masks = WordleSolver._get_letter_masks(self.all_guess_words)
+        # Also precompute each word's letters as a row of 0-25 indexes, plus word -> row maps,
+        # so feedback results can be computed with array ops instead of per-char loops.
+        self.solution_letter_idx = WordleSolver._get_letter_indexes(self.all_solution_words, self.wordlen)
+        self.guess_letter_idx = WordleSolver._get_letter_indexes(self.all_guess_words, self.wordlen)
+        # Single-bit form of the letter-index rows ((nwords, wordlen), bit = 1 << letter index),
+        # so positional filtering is a direct bitwise AND against position_masks.
+        self.solution_letter_bits = np.uint32(1) << self.solution_letter_idx.astype(np.uint32)
+        self.guess_letter_bits = np.uint32(1) << self.guess_letter_idx.astype(np.uint32)
+        self.solution_word_to_idx = { word : i for i, word in enumerate(self.all_solution_words) }
+        self.guess_word_to_idx = { word : i for i, word in enumerate(self.all_guess_words) }
+        # For each guess word, its index in the solution list, or -1 if it's not a solution word;
+        # used to check "is this guess a potential solution" with array ops instead of set lookups.
+        # The reverse map supports restricting candidate guesses to the remaining solutions.
+        self.guess_to_solution_idx = np.array(
+            [ self.solution_word_to_idx.get(word, -1) for word in self.all_guess_words ], dtype=np.int32)
+        self.solution_to_guess_idx = np.array(
+            [ self.guess_word_to_idx.get(word, -1) for word in self.all_solution_words ], dtype=np.int32)
+        # Per-word letter-count rows; letter-count range computation, per-guess scoring, and
+        # filtering gather from these instead of recounting letters per word.
+        self.solution_letter_counts = WordleSolver._get_letter_count_matrix(self.solution_letter_idx)
+        self.guess_letter_counts = WordleSolver._get_letter_count_matrix(self.guess_letter_idx)
+        # Powers of 3 used to encode a result string as a single base-3 integer
+        self._pow3 = 3 ** np.arange(self.wordlen, dtype=np.int64)
         self.const_first_guess = const_first_guess
+        # Cached opening guess; the first guess depends only on the dictionaries, so it is
+        # computed at most once and reused across sessions (eg, by run_eval).
+        self._opening_guess = None
+        # Cached second guesses, keyed by (first guess, result).  The state after one guess is a
+        # pure function of that pair, so second guesses are also reusable across sessions; the
+        # key space is small enough (at most 3^wordlen entries per first word) to cache fully.
+        self._second_guess_cache = {}
+        # Cached letter-count ranges of the full solution set, so repeated resets (eg, by
+        # run_eval) don't rescan the whole count matrix each time.
+        self._initial_letter_bounds = None
+        # Lazily built (nguesses, nsolutions) matrix of encoded feedback results; see
+        # _get_feedback_matrix()
+        self._feedback_matrix = None
+        # Words removed from the dictionaries at runtime (eg, blacklisted in interactive mode).
+        # The word lists and their aligned arrays are never mutated; these masks are applied
+        # when the candidate index arrays are rebuilt in reset().
+        self.blacklisted_solution_mask = np.zeros(len(self.all_solution_words), dtype=bool)
+        self.blacklisted_guess_mask = np.zeros(len(self.all_guess_words), dtype=bool)
+        if numba is not None and len(self.all_guess_words) and len(self.all_solution_words):
+            # Warm up the compiled kernel on a tiny input so the JIT compile (or cache load)
+            # happens at construction time rather than in the middle of the first game
+            _score_codes_kernel(
+                np.zeros((1, 1), dtype=np.min_scalar_type(3 ** self.wordlen - 1)), 3 ** self.wordlen)
         self.reset()
 
-    def _load_words(self, dictfile: str, allow_dup_letters: bool) -> None:
-        """Loads and filters words from a file."""
+    def _load_words(self, dictfile: str, allow_dup_letters: bool) -> list[str]:
+        """Loads and filters words from a file.
+
+        The cleaned word list is cached next to the source file as an encoded .npy so that
+        repeated constructions skip the per-line filtering; a cache older than its source
+        file is ignored and rebuilt.  Failures to read or write the cache are not errors.
+        """
+        cache_file = f'{dictfile}.len{self.wordlen}{"" if allow_dup_letters else ".nodup"}.npy'
+        try:
+            if os.path.getmtime(cache_file) >= os.path.getmtime(dictfile):
+                data = np.load(cache_file).tobytes().decode('ascii')
+                return [ data[i : i + self.wordlen] for i in range(0, len(data), self.wordlen) ]
+        except (OSError, ValueError):
+            pass
+        # Validate, length-filter, and (optionally) duplicate-letter-filter in a single pass.
+        # The str methods are C-level checks equivalent to fullmatching [a-z]+ but without the
+        # per-line regex machinery.
         with open(dictfile, 'r') as f:
-            #all_words = [ re.sub(r'[^a-z]', '', line.lower().strip()) for line in f ]
-            all_words = [ line.lower().strip() for line in f if re.fullmatch(r'[a-z]+', line.strip()) ]
-        all_words = [ word for word in all_words if len(word) == self.wordlen ]
-        # Remove duplicate words (dups can occur after normalizing)
-        all_words = list(set(all_words))
-        # Remove words with duplicate letters
-        def has_dup_letters(word):
-            letterset = set()
-            for l in word:
-                if l in letterset:
-                    return True
-                letterset.add(l)
-            return False
-        if not allow_dup_letters:
-            all_words = [ word for word in all_words if not has_dup_letters(word) ]
+            all_words = [
+                word for word in ( line.strip() for line in f )
+                if len(word) == self.wordlen and word.isascii() and word.isalpha() and word.islower()
+                and (allow_dup_letters or len(set(word)) == len(word))
+            ]
+        # Remove duplicate words, preserving file order so word indexes are stable run to run
+        all_words = list(dict.fromkeys(all_words))
+        try:
+            np.save(cache_file, np.frombuffer(''.join(all_words).encode('ascii'), dtype=np.uint8))
+        except OSError:
+            pass
         return all_words
 
     @staticmethod
-    def _get_letter_counts(word: str, all_letters: bool = False) -> dict[str, int]:
-        """Returns a dict mapping each letter to counts of its occurrences."""
-        r = { l : 0 for l in ALL_LETTERS } if all_letters else {}
-        for l in word:
-            r[l] = r.get(l, 0) + 1
-        return r
+    def _get_letter_masks(words: Sequence[str]) -> np.ndarray:
+        """Returns an array of 26-bit letter-presence bitmasks, one per word, aligned by index."""
+        def word_mask(word):
+            mask = 0
+            for letter in word:
+                mask |= 1 << (ord(letter) - 97)
+            return mask
+        return np.fromiter(( word_mask(word) for word in words ), dtype=np.uint32, count=len(words))
 
     @staticmethod
-    def _get_letter_count_ranges_of_words(words: Sequence[str]) -> dict[str, tuple[int, int]]:
-        """Given a list of words, returns a dict of the range of letter counts, inclusive, that could be in a word."""
-        r = {}
-        for word in words:
-            for letter, count in WordleSolver._get_letter_counts(word, True).items():
-                if letter in r:
-                    c = r[letter]
-                    if count < c[0]:
-                        c = (count, c[1])
-                    if count > c[1]:
-                        c = (c[0], count)
-                    r[letter] = c
-                else:
-                    r[letter] = (count, count)
-        for letter in ALL_LETTERS:
-            if letter not in r:
-                r[letter] = (0, 0)
-        return r
+    def _get_letter_indexes(words: Sequence[str], wordlen: int) -> np.ndarray:
+        """Returns a (nwords, wordlen) uint8 array of 0-25 letter indexes, aligned with words."""
+        if not len(words):
+            return np.zeros((0, wordlen), dtype=np.uint8)
+        return np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(-1, wordlen) - ord('a')
+
+    def _results_vs_all(self, guess_letters: np.ndarray, target_letters: np.ndarray, target_lcounts: Optional[np.ndarray] = None) -> np.ndarray:
+        """Computes the feedback results of one guess against many targets at once.
+
+        Parameters:
+            guess_letters -- (wordlen,) array of the guess's letter indexes
+            target_letters -- (ntargets, wordlen) array of target letter indexes
+            target_lcounts -- optional precomputed (ntargets, 26) letter counts for the targets
+
+        Returns a (ntargets,) int64 array where each result string is encoded as a base-3
+        integer with digit i being 2/1/0 for C/L/X at position i.
+        """
+        ntargets = len(target_letters)
+        greens = guess_letters[None, :] == target_letters
+        # Count remaining (non-green) occurrences of each letter in each target
+        if target_lcounts is None:
+            target_lcounts = np.zeros((ntargets, 26), dtype=np.int8)
+            np.add.at(target_lcounts, (np.arange(ntargets)[:, None], target_letters), 1)
+            remaining = target_lcounts
+        else:
+            remaining = target_lcounts.astype(np.int8, copy=True)
+        green_t, green_pos = np.nonzero(greens)
+        np.subtract.at(remaining, (green_t, guess_letters[green_pos]), 1)
+        codes = greens.astype(np.int64) * 2
+        # Award 'L' codes position by position so that duplicate guess letters consume
+        # the remaining letter counts in order, matching the scalar implementation.
+        for i in range(self.wordlen):
+            letter = guess_letters[i]
+            yellow = ~greens[:, i] & (remaining[:, letter] > 0)
+            codes[yellow, i] = 1
+            remaining[yellow, letter] -= 1
+        return codes @ self._pow3
+
+    def _get_feedback_matrix(self) -> np.ndarray:
+        """Returns a (nguesses, nsolutions) matrix of encoded feedback results.
+
+        Entry [g, s] is the base-3-encoded result of guessing all_guess_words[g] against
+        all_solution_words[s].  The matrix depends only on the dictionaries, so it is built
+        once on first use and reused for the rest of the process; the one-time build cost is
+        amortized over the many scoring passes of an evaluation run.
+        """
+        if self._feedback_matrix is None:
+            sol_lcounts = self.solution_letter_counts.astype(np.int8)
+            matrix = np.empty(
+                (len(self.all_guess_words), len(self.all_solution_words)),
+                dtype=np.min_scalar_type(3 ** self.wordlen - 1))
+            for g in range(len(self.all_guess_words)):
+                matrix[g] = self._results_vs_all(self.guess_letter_idx[g], self.solution_letter_idx, sol_lcounts)
+            self._feedback_matrix = matrix
+        return self._feedback_matrix
+
+    @staticmethod
+    def _get_letter_count_matrix(letter_idx: np.ndarray) -> np.ndarray:
+        """Returns a (nwords, 26) uint8 matrix of per-letter counts from a letter-index array."""
+        counts = np.zeros((len(letter_idx), 26), dtype=np.uint8)
+        np.add.at(counts, (np.arange(len(letter_idx))[:, None], letter_idx), 1)
+        return counts
+
+    def _get_letter_count_ranges(self, solution_idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Given an array of solution word indexes, returns (lbounds, ubounds) (26,) uint8 arrays
+        of the range of counts, inclusive, that each letter could have in a word."""
+        if not len(solution_idx):
+            return np.zeros(26, dtype=np.uint8), np.zeros(26, dtype=np.uint8)
+        counts = self.solution_letter_counts[solution_idx]
+        return counts.min(axis=0), counts.max(axis=0)
 
     def reset(self) -> None:
         """Resets state variables related to a wordle session."""
-        # A list (length self.wordlen) of sets; the current set of allowable letters at each position.
-        self.positions = []
-        for i in range(self.wordlen):
-            self.positions.append(set(ALL_LETTERS))
-        # Map from each letter to a tuple of the upper and lower bound (inclusive) of how many of that letter may be present
-        self.letter_counts = WordleSolver._get_letter_count_ranges_of_words(self.all_solution_words)
-        # Set of words that have been tried so far
+        # An array (length self.wordlen) of 26-bit masks; the current set of allowable letters
+        # at each position, with bit k meaning chr(97 + k) is allowed.
+        self.position_masks = np.full(self.wordlen, ALL_LETTERS_MASK, dtype=np.uint32)
+        # Words that have been tried so far: boolean masks aligned with the word lists for the
+        # vectorized filter, plus the set/list forms for external consumers
+        self.tried_solution_mask = np.zeros(len(self.all_solution_words), dtype=bool)
+        self.tried_guess_mask = np.zeros(len(self.all_guess_words), dtype=bool)
         self.tried_words = set()
         self.tried_word_list = []
-        # Set of words that might be possible solutions at this point
-        self.potential_solutions = set(self.all_solution_words)
+        self.tried_result_list = []
+        # Words that might be possible solutions at this point, as an array of indexes into
+        # all_solution_words.  Filtering shrinks this array with vectorized mask ops; the
+        # potential_solutions property materializes the set of word strings on demand.
+        self.potential_solution_idx = np.flatnonzero(~self.blacklisted_solution_mask).astype(np.int32)
+        # The upper and lower bound (inclusive), per letter, of how many of that letter may be
+        # present, as (26,) arrays indexed by letter
+        if self._initial_letter_bounds is None:
+            self._initial_letter_bounds = self._get_letter_count_ranges(self.potential_solution_idx)
+        self.lbounds = self._initial_letter_bounds[0].copy()
+        self.ubounds = self._initial_letter_bounds[1].copy()
         # Flag indicating if target has been solved
         self.solved = False
         # Queue of constant first words to guess
         self.first_word_queue = [ self.const_first_guess ] if self.const_first_guess and self.const_first_guess in self.all_guess_words else []
         # The set of words that can be guessed is reset each time because it is modified in hard more
-        self.potential_guesses = set(self.all_guess_words)
+        self.potential_guess_idx = np.flatnonzero(~self.blacklisted_guess_mask).astype(np.int32)
+        self._update_constraint_caches()
 
-    def _fast_word_result(self, guess: str, target: str):
-        """Faster word evaluation for internal use"""
-        retval = 0
-        target_lcounts = self._fast_word_result_buf
-        for i in range(self.wordlen):
-            target_lcounts[ord(target[i])] += 1
-        placeval = 1
-        for i in range(self.wordlen):
-            if guess[i] == target[i]:
-                retval += placeval * 2
-                target_lcounts[ord(target[i])] -= 1
-            placeval *= 3
-        placeval = 1
-        for i in range(self.wordlen):
-            g = guess[i]
-            t = target[i]
-            ordg = ord(g)
-            if g != t and target_lcounts[ordg] > 0:
-                retval += placeval
-                target_lcounts[ordg] -= 1
-            placeval *= 3
-        for i in range(self.wordlen):
-            target_lcounts[ord(target[i])] = 0
-        return retval
+    @property
+    def potential_solutions(self) -> set[str]:
+        """The set of words that might still be the solution, built on demand from the index array."""
+        return { self.all_solution_words[i] for i in self.potential_solution_idx }
+
+    @property
+    def potential_guesses(self) -> set[str]:
+        """The set of words that may currently be guessed, built on demand from the index array."""
+        return { self.all_guess_words[i] for i in self.potential_guess_idx }
+
+    def blacklist_word(self, word: str) -> None:
+        """Removes a word from the solution and guess dictionaries for the rest of the process.
+
+        The word lists and their aligned arrays are not mutated (other state is indexed against
+        them); instead the word is dropped from the current candidate arrays and masked out of
+        future resets.
+        """
+        self._opening_guess = None
+        self._second_guess_cache = {}
+        self._initial_letter_bounds = None
+        solution_idx = self.solution_word_to_idx.get(word)
+        if solution_idx is not None:
+            self.blacklisted_solution_mask[solution_idx] = True
+            self.potential_solution_idx = self.potential_solution_idx[self.potential_solution_idx != solution_idx]
+        guess_idx = self.guess_word_to_idx.get(word)
+        if guess_idx is not None:
+            self.blacklisted_guess_mask[guess_idx] = True
+            self.potential_guess_idx = self.potential_guess_idx[self.potential_guess_idx != guess_idx]
 
     def update(self, guessed_word: str, result: str) -> None:
         """Updates the state with the result of a guess.
@@ -133,144 +298,280 @@ class WordleSolver:
         """
         assert(len(guessed_word) == self.wordlen)
         assert(len(result) == self.wordlen)
-        assert(re.fullmatch(r'[CLX]+', result))
-        # Count number of each letter in the guessed word dict[str, int]
-        guess_lcounts = WordleSolver._get_letter_counts(guessed_word, True)
+        assert(_RESULT_RE.fullmatch(result))
+        # Snapshot the constraint state so re-filtering can be skipped if this guess turns out
+        # to reveal no new information
+        prev_position_masks = self.position_masks.tobytes()
+        prev_letter_bounds = self.lbounds.tobytes() + self.ubounds.tobytes()
+        # Count number of each letter in the guessed word, as a (26,) count row; guessed words
+        # are nearly always in the guess dictionary, so this is usually just a row gather
+        guess_idx = self.guess_word_to_idx.get(guessed_word)
+        if guess_idx is not None:
+            guess_lcounts = self.guess_letter_counts[guess_idx]
+        else:
+            guess_lcounts = np.zeros(26, dtype=np.uint8)
+            for letter in guessed_word:
+                guess_lcounts[ord(letter) - 97] += 1
         # Count number of each letter confirmed to be in the solution
-        result_lcounts = { l : 0 for l in ALL_LETTERS }
+        result_lcounts = np.zeros(26, dtype=np.uint8)
         for letter, rchar in zip(guessed_word, result):
             if rchar == 'C' or rchar == 'L':
-                result_lcounts[letter] += 1
-        # Update self.letter_counts accounting for new information
-        for letter in guess_lcounts:
-            gc = guess_lcounts[letter]
-            rc = result_lcounts[letter]
-            crange = self.letter_counts[letter]
-            assert(gc >= rc)
-            if gc > rc:
-                # We guessed more of this letter than there are, so now we know how many of this letter there are exactly
-                crange = (rc, rc)
-            else:
-                # Each instance of the letter we guessed is in the word, so this sets a lower bound on that letter count
-                crange = (rc, crange[1])
-            self.letter_counts[letter] = crange
-        # Update self.positions according to position info in the result
+                result_lcounts[ord(letter) - 97] += 1
+        # Update the letter-count bounds accounting for new information.  Each instance of a
+        # letter confirmed present sets that letter's lower bound; if more of a letter was
+        # guessed than confirmed, we know the letter's count exactly.
+        assert((guess_lcounts >= result_lcounts).all())
+        self.ubounds = np.where(guess_lcounts > result_lcounts, result_lcounts, self.ubounds).astype(np.uint8)
+        self.lbounds = result_lcounts
+        # Update self.position_masks according to position info in the result
         for i, (letter, rchar) in enumerate(zip(guessed_word, result)):
+            bit = 1 << (ord(letter) - 97)
             if rchar == 'C':
                 # This is the only letter that can be in this position
-                self.positions[i] = set([ letter ])
+                self.position_masks[i] = bit
             else:
                 # We know this letter cannot exist in this position
-                self.positions[i].discard(letter)
+                self.position_masks[i] &= np.uint32(ALL_LETTERS_MASK ^ bit)
         # If the sum of all lower bounds on letter counts equals the word length, we know every letter in the word
-        lbound_sum = sum(( lbound for lbound, ubound in self.letter_counts.values() ))
-        if lbound_sum >= self.wordlen:
+        if int(self.lbounds.sum()) >= self.wordlen:
             # All letters' ubounds can be set to their lbounds
-            self.letter_counts = { letter : ( lbound, lbound ) for letter, (lbound, ubound) in self.letter_counts.items() }
-        # Update self.positions to take into account cases where we know all positions of a letter.
+            self.ubounds = self.lbounds.copy()
+        # Update self.position_masks to take into account cases where we know all positions of a letter.
         # This also handles removing letters which cannot be in the solution.
+        # With at most 2 candidates left this refinement can't change which word is guessed
+        # next (get_guess just tries the remaining candidates), so it is skipped.
         # NOTE: This could be improved by also considering positions with limited sets of potential letters
-        for letter, (lbound, ubound) in self.letter_counts.items():
-            # Count positions for which this letter is the only possibility
-            nexclusive = sum(( 1 if letter in lset and len(lset) == 1 else 0 for lset in self.positions ))
-            if nexclusive >= ubound:
-                # We know all the places for this letter, it cannot occur in any other positions
-                for lset in self.positions:
-                    if not (letter in lset and len(lset) == 1):
-                        lset.discard(letter)
-        # Track the guessed words
+        if len(self.potential_solution_idx) > 2:
+            exclusive_bits = np.array([ mask if int(mask).bit_count() == 1 else 0 for mask in self.position_masks ], dtype=np.uint32)
+            remove_mask = 0
+            for k, ubound in enumerate(self.ubounds):
+                bit = 1 << k
+                # Count positions for which this letter is the only possibility
+                nexclusive = int(np.count_nonzero(exclusive_bits == bit))
+                if nexclusive >= ubound:
+                    # We know all the places for this letter, it cannot occur in any other positions
+                    remove_mask |= bit
+            if remove_mask:
+                # Clear the removed letters from every position in one vectorized op, then restore
+                # each position's own exclusively-known letter
+                self.position_masks &= np.uint32(ALL_LETTERS_MASK ^ remove_mask)
+                self.position_masks |= exclusive_bits
+        # Track the guessed words and their results
         self.tried_words.add(guessed_word)
         self.tried_word_list.append(guessed_word)
-        # Update the list of valid solutions at this point
-        self._filter_words_by_known_info(self.potential_solutions)
-        # If in hard mode, also filter potential guesses by known info
-        if self.hard_mode:
-            self._filter_words_by_known_info(self.potential_guesses)
-        # After narrowing down potential solutions, letter count ranges may be narrowed as well
-        self.letter_counts = WordleSolver._get_letter_count_ranges_of_words(list(self.potential_solutions))
+        self.tried_result_list.append(result)
+        tried_solution_idx = self.solution_word_to_idx.get(guessed_word)
+        if tried_solution_idx is not None:
+            self.tried_solution_mask[tried_solution_idx] = True
+        tried_guess_idx = self.guess_word_to_idx.get(guessed_word)
+        if tried_guess_idx is not None:
+            self.tried_guess_mask[tried_guess_idx] = True
+        # Update the list of valid solutions at this point.  If the guess revealed no new
+        # constraints, the full filter would change nothing; only the just-tried word needs to
+        # be dropped from the candidate arrays.
+        npotsols_before = len(self.potential_solution_idx)
+        constraints_changed = (self.position_masks.tobytes() != prev_position_masks
+            or self.lbounds.tobytes() + self.ubounds.tobytes() != prev_letter_bounds)
+        if constraints_changed:
+            # Refresh the cached vectorized constraint forms now that constraints have changed
+            self._update_constraint_caches()
+            self.potential_solution_idx = self._filter_words_by_known_info(
+                self.potential_solution_idx, self.solution_letter_bits, self.solution_word_masks,
+                self.tried_solution_mask, self.solution_letter_counts)
+            # If in hard mode, also filter potential guesses by known info
+            if self.hard_mode:
+                self.potential_guess_idx = self._filter_words_by_known_info(
+                    self.potential_guess_idx, self.guess_letter_bits, self.guess_word_masks,
+                    self.tried_guess_mask, self.guess_letter_counts)
+        else:
+            tried_solution_idx = self.solution_word_to_idx.get(guessed_word)
+            if tried_solution_idx is not None:
+                self.potential_solution_idx = self.potential_solution_idx[self.potential_solution_idx != tried_solution_idx]
+            if self.hard_mode:
+                tried_guess_idx = self.guess_word_to_idx.get(guessed_word)
+                if tried_guess_idx is not None:
+                    self.potential_guess_idx = self.potential_guess_idx[self.potential_guess_idx != tried_guess_idx]
+        # After narrowing down potential solutions, letter count ranges may be narrowed as well.
+        # If no solution was eliminated the ranges cannot have changed, and with at most 2
+        # candidates left they no longer influence any further guess; the rescan is skipped in
+        # both cases.  (Bounds derived from a subset of the surviving words are always at least
+        # as tight as the current ones, so assigning them can only tighten.)
+        if 2 < len(self.potential_solution_idx) < npotsols_before:
+            self.lbounds, self.ubounds = self._get_letter_count_ranges(self.potential_solution_idx)
         # Check if the guessed word was the correct solution
         if result == 'C' * self.wordlen:
             # Correct result was guessed
             self.solved = True
-            self.potential_solutions = set([ guessed_word ])
-
-    def _filter_words_by_known_info(self, words: set[str]) -> None:
-        """Removes words from the set that do not fit known information."""
-        # Filter the set of potential solutions according to which letters are allowed in which positions.
-        # Do this by constructing a regex from self.positions
-        regex_str = ''.join([
-            '[' + ''.join(list(letterset)) + ']'
-            for letterset in self.positions
-        ])
-        rx = re.compile(regex_str)
-        # Filter potential_solutions by this regex, and also make sure letter counts are in bounds for each
-        def word_within_bounds(word):
-            lcounts = WordleSolver._get_letter_counts(word, True)
-            for letter, lcount in lcounts.items():
-                lbound, ubound = self.letter_counts[letter]
-                if not (lbound <= lcount <= ubound):
-                    return False
-            return True
-        for word in list(words):
-            if not (rx.fullmatch(word) and word not in self.tried_words and word_within_bounds(word)):
-                words.discard(word)
+            solution_idx = self.solution_word_to_idx.get(guessed_word)
+            self.potential_solution_idx = np.array([ solution_idx ] if solution_idx is not None else [], dtype=np.int32)
+
+    def _update_constraint_caches(self) -> None:
+        """Recomputes cached vectorized forms of the letter-count and position constraints.
+
+        Called after the letter-count bounds / self.position_masks change, so that filtering (which may
+        run more than once per update in hard mode) can reuse them instead of rebuilding them
+        per call.
+        """
+        letter_bit_values = 1 << np.arange(26, dtype=np.int64)
+        self._require_mask = int(((self.lbounds >= 1) * letter_bit_values).sum())
+        self._exclude_mask = int(((self.ubounds == 0) * letter_bit_values).sum())
+        # Positions ordered most-constrained first, skipping fully-unconstrained ones; used to
+        # order the positional filtering so the candidate set shrinks as early as possible
+        nallowed = ((self.position_masks[:, None] >> np.arange(26)) & 1).sum(axis=1)
+        self._pos_filter_order = [ int(i) for i in np.argsort(nallowed) if nallowed[i] < 26 ]
+
+    def _filter_words_by_known_info(self, word_idx: np.ndarray, word_letter_bits: np.ndarray, word_masks: np.ndarray, tried_mask: np.ndarray, word_lcounts: np.ndarray) -> np.ndarray:
+        """Returns the subset of word_idx whose words fit all known information.
+
+        Parameters:
+            word_idx -- Array of candidate word indexes to filter
+            word_letter_bits -- The full (nwords, wordlen) per-position letter-bit array the indexes refer into
+            word_masks -- The full letter-presence bitmask array the indexes refer into
+            tried_mask -- The full boolean already-tried mask the indexes refer into
+            word_lcounts -- The full (nwords, 26) letter-count matrix the indexes refer into
+        """
+        if not len(word_idx):
+            return word_idx
+        # First run a cheap vectorized prefilter over the words' letter-presence bitmasks.
+        # Letters with a nonzero count lower bound must be present in the word; letters with
+        # a zero upper bound must be absent.  This discards the bulk of invalid words with
+        # numpy array ops before falling back to the more expensive per-word checks.
+        cand_masks = word_masks[word_idx]
+        keep = ((cand_masks & self._require_mask) == self._require_mask) & ((cand_masks & self._exclude_mask) == 0)
+        word_idx = word_idx[keep]
+        # Filter according to which letters are allowed in which positions, one position at a
+        # time with the most constrained position first, shrinking the candidate array at each
+        # step.  This is the flat-array analogue of walking a trie: a word is never examined at
+        # further positions once one position has disqualified it.
+        for i in self._pos_filter_order:
+            if not len(word_idx):
+                return word_idx
+            word_idx = word_idx[(word_letter_bits[word_idx, i] & self.position_masks[i]) != 0]
+        # Drop words that have already been tried with a single mask gather
+        word_idx = word_idx[~tried_mask[word_idx]]
+        # For the words that pass the earlier filters, also make sure letter counts are in
+        # bounds, comparing the surviving count rows against the bounds in one broadcast
+        cand_lcounts = word_lcounts[word_idx]
+        keep = ((cand_lcounts >= self.lbounds) & (cand_lcounts <= self.ubounds)).all(axis=1)
+        return word_idx[keep]
 
     def get_guess(self) -> str:
         # Handle constant first word(s)
         if len(self.first_word_queue):
             return self.first_word_queue.pop(0)
 
-        if len(self.potential_solutions) == 0:
+        # With no information gathered yet, the best guess is always the same; return the
+        # cached opening guess if it has already been computed.  Likewise, the best second
+        # guess depends only on the first guess and its result.
+        if not self.tried_word_list and self._opening_guess is not None:
+            return self._opening_guess
+        second_guess_key = None
+        if len(self.tried_word_list) == 1:
+            second_guess_key = (self.tried_word_list[0], self.tried_result_list[0])
+            cached_guess = self._second_guess_cache.get(second_guess_key)
+            if cached_guess is not None:
+                return cached_guess
+
+        if len(self.potential_solution_idx) == 0:
             # There are no possible solutions
             raise Exception('Answer unknown')
-        elif len(self.potential_solutions) <= 2:
+        elif len(self.potential_solution_idx) <= 2:
             # Either there's 1 possible solution left (in which case it should be the answer), or
             # there are 2 left, and we just need to try each one.  Either way, return the first.
-            return list(self.potential_solutions)[0]
+            return self.all_solution_words[self.potential_solution_idx[0]]
 
         # Determine which guess word best segments the remaining solution set.
-        best_word = None
-        best_score = -1
-
-        # NOTE: If too slow, this can be sped up by restricting the potential_guesses and/or
-        # potential_solutions iterations to a random sample.  This limits the iterations of this
-        # O(nm) loop but does slightly decrease optimality.
-        for word in self.potential_guesses:
-            # Assuming we use this word as our guess, determine how the potential solutions will be grouped based on the obtained info.
-            # For each potential solution, get the result string that would result from trying it, and count how many of each string in each group.
-            solution_group_counts: dict[str, int] = {}
-            for potsol in self.potential_solutions:
-                resstr = self._fast_word_result(word, potsol)
-                solution_group_counts[resstr] = solution_group_counts.get(resstr, 0) + 1
-            # We want to optimize for smallest average expected group size.
-            # The probability of the solution being in a given group is dependent on the group's size, so
-            # the average expected group size is the weighted average of group sizes, weighted by group size.
-            avg_expected_group_size = sum(( s * s for s in solution_group_counts.values() )) / sum(( s for s in solution_group_counts.values() ))
-            word_score = avg_expected_group_size
-            # Add a small boost if this word is one of the possible solutions
-            if word in self.potential_solutions:
-                word_score -= 0.01
-            # Minimize the score
-            if word_score < best_score or best_score == -1:
-                best_score = word_score
-                best_word = word
-
+        npotsols = len(self.potential_solution_idx)
+
+        # In the endgame, first score just the remaining solutions as guesses: if one of them
+        # distinguishes every remaining solution it can win outright and otherwise identifies
+        # the answer, so it is optimal and the full-dictionary scan (whose potential-solution
+        # bonus would select it anyway) can be skipped.
+        if npotsols <= 5:
+            endgame_idx = self.solution_to_guess_idx[self.potential_solution_idx]
+            endgame_idx = endgame_idx[endgame_idx >= 0]
+            if len(endgame_idx):
+                codes = self._get_feedback_matrix()[endgame_idx][:, self.potential_solution_idx]
+                for n, guess_idx in enumerate(endgame_idx):
+                    if len(np.unique(codes[n])) == npotsols:
+                        return self.all_guess_words[guess_idx]
+
+        # Per-guess flag for whether the guess is itself a potential solution, computed with a
+        # membership mask over solution indexes (the extra trailing slot absorbs the -1 entries
+        # of guess_to_solution_idx, ie guesses that aren't solution words at all).
+        potsol_member = np.zeros(len(self.all_solution_words) + 1, dtype=bool)
+        potsol_member[self.potential_solution_idx] = True
+        guess_is_potsol = potsol_member[self.guess_to_solution_idx[self.potential_guess_idx]]
+
+        if numba is not None:
+            # Score every potential guess in one shot with the compiled parallel kernel,
+            # gathering each guess's precomputed feedback codes against the surviving solutions
+            codes = self._get_feedback_matrix()[self.potential_guess_idx][:, self.potential_solution_idx]
+            scores = _score_codes_kernel(codes, 3 ** self.wordlen)
+            # Add a small boost to words that are themselves potential solutions
+            scores[guess_is_potsol] += 0.01
+            best_word = self.all_guess_words[self.potential_guess_idx[int(np.argmax(scores))]]
+            if not self.tried_word_list:
+                self._opening_guess = best_word
+            elif second_guess_key is not None:
+                self._second_guess_cache[second_guess_key] = best_word
+            return best_word
+
+        # Score every guess with a segmented bincount: gather the feedback-matrix rows for the
+        # surviving solutions, offset each guess's codes into its own histogram segment, and
+        # count the whole chunk in one C-level pass.  Each guess's score is the Shannon entropy
+        # of its result-group size distribution (rewritten as log(n) - sum(c*log(c))/n), so the
+        # chosen guess most evenly (and finely) partitions the remaining solutions, i.e. it has
+        # the greatest expected information.  Guesses are processed in chunks to bound the size
+        # of the offset-code and histogram temporaries.
+        feedback_matrix = self._get_feedback_matrix()
+        npatterns = 3 ** self.wordlen
+        nguesses = len(self.potential_guess_idx)
+        scores = np.empty(nguesses, dtype=np.float64)
+        chunk_size = max(1, (1 << 22) // npotsols)
+        for start in range(0, nguesses, chunk_size):
+            chunk_idx = self.potential_guess_idx[start : start + chunk_size]
+            codes = feedback_matrix[chunk_idx][:, self.potential_solution_idx].astype(np.int64)
+            codes += np.arange(len(chunk_idx))[:, None] * npatterns
+            group_counts = np.bincount(codes.ravel(), minlength=len(chunk_idx) * npatterns)
+            group_counts = group_counts.reshape(len(chunk_idx), npatterns).astype(np.float64)
+            plogp = group_counts * np.log(np.maximum(group_counts, 1))
+            scores[start : start + len(chunk_idx)] = np.log(npotsols) - plogp.sum(axis=1) / npotsols
+        # Add a small boost to words that are themselves potential solutions
+        scores[guess_is_potsol] += 0.01
+        best_word = self.all_guess_words[self.potential_guess_idx[int(np.argmax(scores))]]
+
+        if not self.tried_word_list:
+            self._opening_guess = best_word
+        elif second_guess_key is not None:
+            self._second_guess_cache[second_guess_key] = best_word
         return best_word
 
     @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
     def get_word_result(guess: str, target: str) -> str:
-        """Returns the result string generated by comparing a guessed word to the correct target word."""
-        r_list = [ 'X' ] * len(target)
-        target_lcounts = WordleSolver._get_letter_counts(target, True)
-        for i, (guess_letter, target_letter) in enumerate(zip(guess, target)):
+        """Returns the result string generated by comparing a guessed word to the correct target word.
+
+        Results are memoized; this is a pure function of the two words, and callers such as
+        run_eval evaluate many repeated (guess, target) pairs.
+        """
+        # Work on encoded bytes with byte-indexed buffers; integer compares, bytearray writes,
+        # and a single final decode avoid per-char str objects and dict hashing in this scalar path.
+        result = bytearray(b'X' * len(target))
+        guess_bytes = guess.encode('ascii')
+        target_bytes = target.encode('ascii')
+        target_lcounts = bytearray(26)
+        for letter in target_bytes:
+            target_lcounts[letter - 97] += 1
+        for i, (guess_letter, target_letter) in enumerate(zip(guess_bytes, target_bytes)):
             if guess_letter == target_letter:
-                r_list[i] = 'C'
-                target_lcounts[target_letter] -= 1
-        for i, (guess_letter, target_letter) in enumerate(zip(guess, target)):
-            if guess_letter != target_letter and target_lcounts[guess_letter] > 0:
-                r_list[i] = 'L'
-                target_lcounts[guess_letter] -= 1
-        return ''.join(r_list)
+                result[i] = 67  # 'C'
+                target_lcounts[target_letter - 97] -= 1
+        for i, (guess_letter, target_letter) in enumerate(zip(guess_bytes, target_bytes)):
+            if guess_letter != target_letter and target_lcounts[guess_letter - 97] > 0:
+                result[i] = 76  # 'L'
+                target_lcounts[guess_letter - 97] -= 1
+        return result.decode('ascii')
 
     def run_auto(self, target_word: str) -> int:
         """Runs the game trying to guess a given target word.  Returns the number of guesses required."""
@@ -290,7 +591,7 @@ def run_interactive(solver):
     while True:
         guess = solver.get_guess()
         print('Guess: ' + guess)
-        if len(solver.potential_solutions) == 1:
+        if len(solver.potential_solution_idx) == 1:
             print('That\'s the last possible solution in this dictionary.')
             return
         print('Enter feedback string using letters C, L, X.  Enter ! to blacklist word.  Or, to specify the word to guess: <word> <feedback>')
@@ -302,16 +603,7 @@ def run_interactive(solver):
             solver.update(parts[0], parts[1])
         elif res == '!':
             print('Blacklisting word ' + guess)
-            solver.potential_solutions.discard(guess)
-            try:
-                solver.all_solution_words.remove(guess)
-            except ValueError:
-                pass
-            try:
-                solver.all_guess_words.remove(guess)
-            except ValueError:
-                pass
-
+            solver.blacklist_word(guess)
             continue
         else:
             solver.update(guess, res)
@@ -324,21 +616,49 @@ def run_target(solver, target):
     print('\n'.join(solver.tried_word_list))
     print(target)
 
-def run_eval(solver):
+# Per-worker solver used by run_eval; initialized once per worker process so the dictionary
+# loading and precomputed arrays are not rebuilt per target.
+_eval_solver = None
+
+def _init_eval_worker(solver):
+    global _eval_solver
+    _eval_solver = solver
+
+def _eval_one_target(target):
+    return target, _eval_solver.run_auto(target)
+
+def run_eval(solver, nprocs=None):
     wlist = solver.all_solution_words.copy()
     random.shuffle(wlist)
     histogram = {}
     failed_words = []
     nwords = 0
     totalguesses = 0
-    for word in wlist:
-        nguesses = solver.run_auto(word)
+    if nprocs is None:
+        nprocs = os.cpu_count() or 1
+    pool = None
+    if nprocs > 1:
+        # Each target is an independent solve, so fan the targets out across worker
+        # processes.  Workers receive the fully-constructed solver once at startup.  Spawned
+        # (rather than forked) workers are required: the solver has already run numba's
+        # thread-pooled kernels by this point, and forking a process with an initialized
+        # threading layer deadlocks the children.  Build the feedback matrix up front so the
+        # pickled solver carries it to every worker rather than each one rebuilding it.
+        solver._get_feedback_matrix()
+        pool = multiprocessing.get_context('spawn').Pool(nprocs, initializer=_init_eval_worker, initargs=(solver,))
+        results = pool.imap_unordered(_eval_one_target, wlist, chunksize=16)
+    else:
+        results = ( (word, solver.run_auto(word)) for word in wlist )
+    for word, nguesses in results:
         print('Target word', word, 'num guesses', nguesses)
         histogram[nguesses] = histogram.get(nguesses, 0) + 1
         if nguesses > 6:
             failed_words.append(word)
         nwords += 1
         totalguesses += nguesses
+    if pool is not None:
+        pool.close()
+        pool.join()
     print('nguesses histogram:')
     for nguesses, cnt in sorted(list(histogram.items()), key=lambda tup: tup[0]):
         print(f'{nguesses} guesses: {cnt} words')
@@ -354,6 +674,7 @@ if __name__ == '__main__':
     argparser.add_argument('-w', action='store', help='Solve target word mode')
     argparser.add_argument('-e', action='store_true', help='Evaluation/auto mode')
     argparser.add_argument('-H', action='store_true', help='Hard mode (only guess potential solutions)')
+    argparser.add_argument('-j', action='store', type=int, help='Number of worker processes for evaluation mode (default: all cores)')
     args = argparser.parse_args()
 
     solver = WordleSolver(hard_mode=args.H)
@@ -369,7 +690,7 @@ if __name__ == '__main__':
         run_target(solver, args.w)
 
     elif args.e:
-        run_eval(solver)
+        run_eval(solver, nprocs=args.j)
 
     else:
         raise Exception('Must supply one of -h, -i, -w <Target>, -e')